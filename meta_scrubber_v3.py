@@ -1,21 +1,424 @@
+import argparse
+import atexit
+import glob
 import os
+import re
 import sys
 import csv
+import shutil
+import struct
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
-from PIL import Image, ExifTags
+from functools import partial
 from PIL.ExifTags import TAGS, GPSTAGS
-from tqdm import tqdm
-import time
-import piexif
 
-class MetadataScrubber:
+# Pillow's Image module, piexif and tqdm are imported where they are used so
+# that --help and the menu start without loading them. Standard EXIF tag IDs
+# are spelled out here for the same reason.
+_EXIF_IFD_TAG = 0x8769
+_GPS_IFD_TAG = 0x8825
+_INTEROP_IFD_TAG = 0xA005
+
+# DateTime, DateTimeOriginal, DateTimeDigitized
+_DT_IDS = frozenset((0x0132, 0x9003, 0x9004))
+_DT_NAMES = frozenset(TAGS[tag] for tag in _DT_IDS)
+_POINTER_TAGS = frozenset((_EXIF_IFD_TAG, _GPS_IFD_TAG, _INTEROP_IFD_TAG))
+
+_LOG_HEADERS = ('Timestamp', 'Original File', 'New File', 'Metadata Removed')
+
+# Row templates for the metadata tables, bound once instead of per row
+_ITEM_FMT = "{:<30}: {}".format
+_ROW_FMT = "{:<30} | {:<25} | {:<25}{}".format
+
+# Readable GPS names are built once here rather than per tag
+_GPS_PREFIXED = {tag_id: f"GPS {name}" for tag_id, name in GPSTAGS.items()}
+
+# Names written by _reserve_clean_path; such files found by directory or glob
+# expansion are never re-scrubbed
+_CLEAN_NAME = re.compile(r'_clean_\d+\.jpe?g$', re.IGNORECASE)
+
+# Byte size of each TIFF field type, used when walking raw IFD entries
+_TIFF_TYPE_SIZES = {1: 1, 2: 1, 3: 2, 4: 4, 5: 8, 6: 1, 7: 1, 8: 2, 9: 4, 10: 8, 11: 4, 12: 8}
+
+def _rational(num, den):
+    """Turn a rational into a float the way Pillow's IFDRational does"""
+    return num / den if den else float('nan')
+
+def _blank_gps_ifd(segment):
+    """Zero the GPS IFD (entries and out-of-line values) inside an APP1 segment
+
+    segment starts with the Exif header; offsets in the TIFF block are
+    relative to byte 6. The GPS pointer in IFD0 is left pointing at an
+    IFD with no entries.
+    """
+    tiff = 6
+    if segment[tiff:tiff + 2] == b'II':
+        endian = '<'
+    elif segment[tiff:tiff + 2] == b'MM':
+        endian = '>'
+    else:
+        return False
+
+    def zero(start, end):
+        if start < tiff or end > len(segment):
+            raise IndexError("offset outside APP1 segment")
+        segment[start:end] = bytes(end - start)
+
+    ifd0 = tiff + struct.unpack_from(endian + 'I', segment, tiff + 4)[0]
+    gps_ifd = None
+    for i in range(struct.unpack_from(endian + 'H', segment, ifd0)[0]):
+        entry = ifd0 + 2 + 12 * i
+        if struct.unpack_from(endian + 'H', segment, entry)[0] == _GPS_IFD_TAG:
+            gps_ifd = tiff + struct.unpack_from(endian + 'I', segment, entry + 8)[0]
+            break
+    if gps_ifd is None:
+        return True
+
+    count = struct.unpack_from(endian + 'H', segment, gps_ifd)[0]
+    for i in range(count):
+        entry = gps_ifd + 2 + 12 * i
+        field_type, field_count = struct.unpack_from(endian + 'HI', segment, entry + 2)
+        size = _TIFF_TYPE_SIZES.get(field_type, 1) * field_count
+        if size > 4:
+            value = tiff + struct.unpack_from(endian + 'I', segment, entry + 8)[0]
+            zero(value, value + size)
+    # Entry count and next-IFD pointer both become 0
+    zero(gps_ifd, gps_ifd + 2 + 12 * count + 4)
+    return True
+
+def fast_remove_gps(path):
+    """Remove GPS data from a JPEG in place by patching only its APP1 segment
+
+    Nothing is decoded and only the EXIF segment is read and written back.
+    Returns False without touching the file when it doesn't have the
+    expected layout, so callers can fall back to a full rewrite.
+    """
+    with open(path, 'r+b') as f:
+        if f.read(2) != b'\xff\xd8':
+            return False
+
+        # Walk the segments before the image data looking for EXIF
+        while True:
+            header = f.read(4)
+            if len(header) < 4 or header[0] != 0xFF:
+                return False
+            marker = header[1]
+            length = struct.unpack('>H', header[2:])[0]
+            # The length field counts itself, so anything below 2 is corrupt
+            if length < 2:
+                return False
+            if marker == 0xE1:
+                start = f.tell()
+                segment = bytearray(f.read(length - 2))
+                if len(segment) < length - 2:
+                    return False
+                if segment.startswith(b'Exif\x00\x00'):
+                    break
+            elif 0xE0 <= marker <= 0xEF or marker == 0xFE:
+                f.seek(length - 2, os.SEEK_CUR)
+            else:
+                return False
+
+        try:
+            if not _blank_gps_ifd(segment):
+                return False
+        except (struct.error, IndexError, ValueError):
+            return False
+
+        f.seek(start)
+        f.write(segment)
+    return True
+
+class ExifBackend:
+    """Interface for reading and removing EXIF metadata in place"""
+
+    def load(self, path, exif_bytes=None):
+        """Return the EXIF data stored in path
+
+        exif_bytes may hold the already-read EXIF block of path, as for
+        remove_tags.
+        """
+        raise NotImplementedError
+
+    def remove_tags(self, path, tags, exif_bytes=None):
+        """Remove the given EXIF tag IDs from path and return the remaining data
+
+        exif_bytes may hold the already-read EXIF block of path so backends
+        that can parse it from memory don't have to read the file again.
+        """
+        raise NotImplementedError
+
+    def remove_gps(self, path, exif_bytes=None):
+        """Remove all GPS tags from path and return the remaining data
+
+        May return None when the file was patched without being parsed; the
+        caller then loads it only if it needs the data.
+        """
+        raise NotImplementedError
+
+    def remove_all(self, path):
+        """Remove every EXIF tag from path and return the (empty) remaining data"""
+        raise NotImplementedError
+
+    def to_readable(self, data, wanted="all"):
+        """Convert loaded data to the same readable format as get_readable_exif"""
+        raise NotImplementedError
+
+class PiexifBackend(ExifBackend):
+    """EXIF access through piexif, rewriting only the APP1 segment"""
+
+    def __init__(self):
+        import piexif
+        self._piexif = piexif
+
+    def load(self, path, exif_bytes=None):
+        return self._piexif.load(exif_bytes or path)
+
+    def remove_tags(self, path, tags, exif_bytes=None):
+        exif_dict = self._piexif.load(exif_bytes or path)
+        zeroth = exif_dict['0th']
+        exif_ifd = exif_dict['Exif']
+        for tag in tags:
+            zeroth.pop(tag, None)
+            exif_ifd.pop(tag, None)
+        self._write(path, exif_dict)
+        return exif_dict
+
+    def remove_gps(self, path, exif_bytes=None):
+        # Nothing is parsed unless the in-place patch can't be applied
+        if fast_remove_gps(path):
+            return None
+        exif_dict = self._piexif.load(exif_bytes or path)
+        exif_dict['GPS'] = {}
+        self._write(path, exif_dict)
+        return exif_dict
+
+    def remove_all(self, path):
+        self._piexif.remove(path)
+        return {'0th': {}, 'Exif': {}, 'GPS': {}, 'Interop': {}, '1st': {}, 'thumbnail': None}
+
+    def _write(self, path, exif_dict):
+        self._piexif.insert(self._piexif.dump(exif_dict), path)
+
+    def to_readable(self, data, wanted="all"):
+        readable_exif = {}
+        tag_name = TAGS.get
+        gps_name = _GPS_PREFIXED.get
+
+        if wanted == "gps":
+            ifds = ('GPS',)
+        else:
+            ifds = ('0th', 'Exif', 'GPS') if wanted == "all" else ('0th', 'Exif')
+
+        for ifd in ifds:
+            ifd_dict = data.get(ifd, {})
+            if wanted == "datetime":
+                items = [(tag_id, ifd_dict[tag_id]) for tag_id in _DT_IDS if tag_id in ifd_dict]
+            else:
+                items = ifd_dict.items()
+
+            for tag_id, value in items:
+                if tag_id in _POINTER_TAGS:
+                    continue
+                tag_type = self._piexif.TAGS[ifd].get(tag_id, {}).get('type')
+
+                # Decode values the same way Pillow does when reading
+                # (piexif already drops the terminating null)
+                if tag_type == self._piexif.TYPES.Ascii and isinstance(value, bytes):
+                    value = value.decode('latin-1', 'replace')
+                elif tag_type == self._piexif.TYPES.Byte:
+                    value = bytes(value) if isinstance(value, tuple) else bytes((value,))
+                elif tag_type in (self._piexif.TYPES.Rational, self._piexif.TYPES.SRational):
+                    if value and isinstance(value[0], tuple):
+                        value = tuple(_rational(num, den) for num, den in value)
+                    elif value:
+                        value = _rational(*value)
+
+                if ifd == 'GPS':
+                    readable_exif[gps_name(tag_id) or f'GPS {tag_id}'] = value
+                else:
+                    readable_exif[tag_name(tag_id, tag_id)] = value
+
+        return readable_exif
+
+class PillowBackend(PiexifBackend):
+    """Fallback that edits with piexif but saves the image again through Pillow"""
+
+    def _write(self, path, exif_dict):
+        from PIL import Image
+
+        with Image.open(path) as img:
+            img.load()
+            # 'keep' reuses the source quantization tables and subsampling
+            # instead of re-encoding at a new quality; it only works for
+            # images loaded from JPEG, which get_file_path already enforces
+            img.save(path, "JPEG", exif=self._piexif.dump(exif_dict),
+                     quality='keep', subsampling='keep', optimize=False)
+
+def _exiv2_number(text, type_name):
+    """Convert one exiv2 value string to the number Pillow would give"""
+    if type_name in ('Rational', 'SRational'):
+        num, _, den = text.partition('/')
+        return _rational(int(num), int(den or 1))
+    if type_name in ('Float', 'Double'):
+        return float(text)
+    return int(text)
+
+class Pyexiv2Backend(ExifBackend):
+    """EXIF access through exiv2, which parses and rewrites metadata in C++"""
+
+    # Only the IFDs Pillow reads, so thumbnail, interop and maker note
+    # groups don't show up in the view or the comparison
+    _GROUPS = ('Image', 'Photo', 'GPSInfo')
+
     def __init__(self):
+        # Optional dependency, only needed when this backend is selected
+        try:
+            import pyexiv2
+        except ImportError:
+            raise ImportError("the pyexiv2 backend needs pyexiv2 installed (pip install pyexiv2)") from None
+        self._pyexiv2 = pyexiv2
+
+    def load(self, path, exif_bytes=None):
+        # exiv2 only parses whole files, so exif_bytes can't be used here
+        with self._pyexiv2.Image(path) as img:
+            return img.read_exif_detail()
+
+    def remove_tags(self, path, tags, exif_bytes=None):
+        names = {TAGS.get(tag) for tag in tags}
+        return self._remove_matching(path, lambda key: key.rsplit('.', 1)[-1] in names)
+
+    def remove_gps(self, path, exif_bytes=None):
+        return self._remove_matching(path, lambda key: key.startswith('Exif.GPSInfo.'))
+
+    def remove_all(self, path):
+        with self._pyexiv2.Image(path) as img:
+            img.clear_exif()
+        return {}
+
+    def _remove_matching(self, path, matches):
+        with self._pyexiv2.Image(path) as img:
+            data = img.read_exif_detail()
+            removed = {key: None for key in data if matches(key)}
+            if removed:
+                img.modify_exif(removed)
+        return {key: value for key, value in data.items() if key not in removed}
+
+    def to_readable(self, data, wanted="all"):
+        readable_exif = {}
+
+        for key, detail in data.items():
+            group = key.split('.', 2)[1]
+            tag_id = detail['tagNumber']
+            if group not in self._GROUPS or tag_id in _POINTER_TAGS:
+                continue
+            if group == 'GPSInfo':
+                if wanted not in ("all", "gps"):
+                    continue
+                name = _GPS_PREFIXED.get(tag_id) or f'GPS {tag_id}'
+            elif wanted == "all" or (wanted == "datetime" and tag_id in _DT_IDS):
+                name = TAGS.get(tag_id, tag_id)
+            else:
+                continue
+            readable_exif[name] = self._convert(detail['value'], detail['typeName'])
+
+        return readable_exif
+
+    @staticmethod
+    def _convert(value, type_name):
+        """Turn exiv2's string form of a value into the type Pillow returns"""
+        if type_name == 'Ascii':
+            return value
+        parts = value.split()
+        try:
+            if type_name in ('Byte', 'Undefined'):
+                return bytes(int(part) for part in parts)
+            numbers = tuple(_exiv2_number(part, type_name) for part in parts)
+        except ValueError:
+            # exiv2 already interpreted it (e.g. UserComment), keep its text
+            return value
+        return numbers[0] if len(numbers) == 1 else numbers
+
+_BACKENDS = {
+    "piexif": PiexifBackend,
+    "pillow": PillowBackend,
+    "pyexiv2": Pyexiv2Backend,
+}
+
+def get_backend():
+    """Create the EXIF backend named by METASCRUB_BACKEND (default: piexif)"""
+    name = os.environ.get("METASCRUB_BACKEND", "piexif").strip().lower()
+    if name not in _BACKENDS:
+        raise ValueError(f"Unknown METASCRUB_BACKEND '{name}', choose from: {', '.join(_BACKENDS)}")
+    return _BACKENDS[name]()
+
+def _remove_metadata(backend, path, metadata_type, exif_bytes=None):
+    """Remove the requested metadata from path in place and return what remains"""
+    if metadata_type == "datetime":
+        return backend.remove_tags(path, _DT_IDS, exif_bytes)
+    elif metadata_type == "gps":
+        return backend.remove_gps(path, exif_bytes)
+    elif metadata_type == "all":
+        return backend.remove_all(path)
+    return backend.load(path)
+
+def _reserve_clean_path(path, output_dir=None):
+    """Atomically create an empty <stem>_clean_N.jpg that no other file uses
+
+    O_EXCL makes the name ours even with several workers writing to the same
+    directory, so nothing that was already there gets overwritten.
+    """
+    stem = os.path.splitext(path)[0]
+    if output_dir:
+        stem = os.path.join(output_dir, os.path.basename(stem))
+    n = 1
+    while True:
+        new_path = f"{stem}_clean_{n}.jpg"
+        try:
+            os.close(os.open(new_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+            return new_path
+        except FileExistsError:
+            n += 1
+
+def _scrub_one(path, metadata_type, output_dir=None, paranoid=False):
+    """Scrub a single file for batch mode, returning (path, new_path)
+
+    With paranoid set the cleaned file is read back from disk and rejected
+    if any of the requested metadata is still there.
+    """
+    new_path = None
+    try:
+        new_path = _reserve_clean_path(path, output_dir)
+        shutil.copyfile(path, new_path)
+        backend = get_backend()
+        _remove_metadata(backend, new_path, metadata_type)
+        if paranoid and backend.to_readable(backend.load(new_path), metadata_type):
+            raise ValueError(f"{metadata_type} metadata still present after scrubbing")
+        return path, new_path
+    except Exception as e:
+        print(f"Error during metadata removal for {path}: {e}")
+        # Don't leave a half-scrubbed copy behind; new_path was created by
+        # this call, so it can't be another worker's output
+        if new_path is not None:
+            os.remove(new_path)
+        return path, None
+
+class MetadataScrubber:
+    def __init__(self, paranoid=False):
         self.file_path = None
-        self.original_metadata = {}
+        self.original_exif = None
+        self._source_exif_bytes = None
         self.scrubbed_options = set()
         self.clean_file_count = 0
         self.log_file = "metadata_changes.csv"
+        self._log_fh = None
+        self._log_writer = None
         self.latest_clean_file = None
+        self._metadata_cache = {}
+        self.backend = get_backend()
+        # Re-read cleaned files from disk when verifying instead of trusting
+        # the metadata that was just written
+        self.paranoid = paranoid
         
     def welcome_screen(self):
         print("\n" + "="*50)
@@ -35,35 +438,47 @@ class MetadataScrubber:
             else:
                 print("Error: File not found. Please try again.")
 
-    def get_readable_exif(self, exif_dict):
-        """Convert EXIF data to readable format similar to ExifTool"""
-        readable_exif = {}
-        if not exif_dict:
-            return readable_exif
+    def get_readable_exif(self, exif, wanted="all"):
+        """Yield (name, value) pairs from a Pillow Exif object, similar to ExifTool
 
-        for tag_id in exif_dict:
-            try:
-                tag = TAGS.get(tag_id, tag_id)
-                data = exif_dict.get(tag_id)
-                
-                # Handle GPS data specially
-                if tag == 'GPSInfo':
-                    for gps_tag in data:
-                        sub_tag = GPSTAGS.get(gps_tag, gps_tag)
-                        sub_value = data[gps_tag]
-                        readable_exif[f'GPS {sub_tag}'] = sub_value
-                else:
-                    readable_exif[tag] = data
-            except Exception:
-                continue
-                
-        return readable_exif
+        Values are only decoded as they are yielded, and the GPS IFD is only
+        parsed when GPS tags are wanted. wanted may be "gps" or "datetime" to
+        only walk that subset.
+        """
+        if not exif:
+            return
+
+        tag_name = TAGS.get
+        gps_name = _GPS_PREFIXED.get
+
+        if wanted != "gps":
+            for ifd in (exif, exif.get_ifd(_EXIF_IFD_TAG)):
+                tag_ids = _DT_IDS if wanted == "datetime" else list(ifd)
+                for tag_id in tag_ids:
+                    if tag_id not in ifd or tag_id in _POINTER_TAGS:
+                        continue
+                    try:
+                        data = ifd[tag_id]
+                    except Exception:
+                        continue
+                    yield tag_name(tag_id, tag_id), data
+
+        # Handle GPS data specially
+        if wanted in ("all", "gps"):
+            for gps_tag, sub_value in exif.get_ifd(_GPS_IFD_TAG).items():
+                yield gps_name(gps_tag) or f'GPS {gps_tag}', sub_value
+
+    def _write_rows(self, rows):
+        """Print rows as lines, in a single write rather than one per tag"""
+        sys.stdout.write('\n'.join(rows) + '\n')
 
     def display_exif_tool_style(self, metadata, title="Current Metadata:"):
         """Display metadata in ExifTool style format"""
-        print(f"\n{title}")
-        print("-" * 50)
-        for tag, value in sorted(metadata.items()):
+        if isinstance(metadata, dict):
+            metadata = metadata.items()
+        
+        rows = [f"\n{title}", "-" * 50]
+        for tag, value in sorted(metadata, key=lambda item: str(item[0])):
             # Format the value based on its type
             if isinstance(value, bytes):
                 formatted_value = f"[{len(value)} bytes of binary data]"
@@ -72,16 +487,21 @@ class MetadataScrubber:
             else:
                 formatted_value = str(value)
             
-            print(f"{tag:<30}: {formatted_value}")
-        print("-" * 50)
+            rows.append(_ITEM_FMT(tag, formatted_value))
+        rows.append("-" * 50)
+        self._write_rows(rows)
 
     def extract_metadata(self):
+        from PIL import Image
+
         try:
+            # Open the source once; everything later works from these copies
             with Image.open(self.file_path) as img:
-                exif = img._getexif()
+                self._source_exif_bytes = img.info.get('exif')
+                exif = img.getexif()
                 if exif:
-                    self.original_metadata = self.get_readable_exif(exif)
-                    self.display_exif_tool_style(self.original_metadata, "Original Metadata:")
+                    # Keep Pillow's lazy Exif object; tags are decoded on demand
+                    self.original_exif = exif
                     return True
                 else:
                     print("No EXIF data found in image.")
@@ -93,78 +513,69 @@ class MetadataScrubber:
     def show_menu(self):
         while True:
             print("\nMetadata Scrubbing Options:")
-            print("1. Remove Date/Time Information")
-            print("2. Remove GPS Location")
-            print("3. View Current Metadata")
-            print("4. Compare Original vs Current Metadata")
-            print("5. Quit")
+            print("1. View Original Metadata")
+            print("2. Remove Date/Time Information")
+            print("3. Remove GPS Location")
+            print("4. View Current Metadata")
+            print("5. Compare Original vs Current Metadata")
+            print("6. Quit")
             
-            choice = input("\nEnter your choice (1-5): ").strip()
+            choice = input("\nEnter your choice (1-6): ").strip()
             
             if choice == "1":
-                self.scrub_metadata("datetime")
+                self.display_exif_tool_style(self._original_metadata(), "Original Metadata:")
             elif choice == "2":
-                self.scrub_metadata("gps")
+                self.scrub_metadata("datetime")
             elif choice == "3":
-                self.view_current_metadata()
+                self.scrub_metadata("gps")
             elif choice == "4":
-                self.compare_metadata()
+                self.view_current_metadata()
             elif choice == "5":
+                self.compare_metadata()
+            elif choice == "6":
                 print("\nThank you for using Image Metadata Scrubber!")
                 sys.exit(0)
             else:
                 print("\nInvalid choice. Please try again.")
 
     def scrub_metadata(self, metadata_type):
+        from tqdm import tqdm
+
+        # Skip the copy entirely if the source has nothing to remove
+        if metadata_type in ("datetime", "gps"):
+            if next(self.get_readable_exif(self.original_exif, metadata_type), None) is None:
+                label = "date/time" if metadata_type == "datetime" else "GPS"
+                print(f"\nNo {label} metadata present; skipping.")
+                return
+
         try:
             print(f"\nRemoving {metadata_type} metadata...")
-            progress_bar = tqdm(total=100, desc="Processing", ncols=75)
-            
-            # Read the image
-            img = Image.open(self.file_path)
-            
-            # Create new exif dictionary
-            exif_dict = piexif.load(img.info['exif']) if 'exif' in img.info else {'0th': {}, '1st': {}, 'Exif': {}, 'GPS': {}, 'Interop': {}}
-            
-            # Update progress
-            for i in range(50):
-                time.sleep(0.02)
+            progress_bar = tqdm(total=2, desc="Processing", ncols=75)
+            try:
+                # Claim a new filename; O_EXCL keeps earlier outputs, batch
+                # ones included, from being overwritten
+                self.clean_file_count += 1
+                new_file = _reserve_clean_path(self.file_path)
+                
+                # Copy the original; the backend then rewrites only its EXIF
+                # segment, leaving the compressed image data untouched.
+                # copyfile lets the kernel do the copy (sendfile/copy_file_range)
+                # without pulling the whole image into Python memory
+                shutil.copyfile(self.file_path, new_file)
                 progress_bar.update(1)
-            
-            # Remove specific metadata
-            if metadata_type == "datetime":
-                date_time_tags = [piexif.ImageIFD.DateTime, piexif.ExifIFD.DateTimeOriginal, 
-                                piexif.ExifIFD.DateTimeDigitized]
-                for tag in date_time_tags:
-                    if tag in exif_dict['0th']:
-                        del exif_dict['0th'][tag]
-                    if tag in exif_dict['Exif']:
-                        del exif_dict['Exif'][tag]
                 
-            elif metadata_type == "gps":
-                exif_dict['GPS'] = {}
-            
-            # Create new filename
-            self.clean_file_count += 1
-            base_name = os.path.splitext(self.file_path)[0]
-            new_file = f"{base_name}_clean_{self.clean_file_count}.jpg"
-            
-            # Convert exif dict to bytes
-            exif_bytes = piexif.dump(exif_dict)
-            
-            # Save new image
-            img.save(new_file, "JPEG", exif=exif_bytes, quality=100)
+                # Remove specific metadata and remember what was written so
+                # later reads don't reopen the file (None if it wasn't parsed)
+                exif_data = _remove_metadata(
+                    self.backend, new_file, metadata_type, self._source_exif_bytes)
+                self._metadata_cache[new_file] = exif_data
+                progress_bar.update(1)
+            finally:
+                progress_bar.close()
             
             # Store the latest clean file path
             self.latest_clean_file = new_file
             
-            # Update progress
-            for i in range(50):
-                time.sleep(0.02)
-                progress_bar.update(1)
-            
-            progress_bar.close()
-            
             # Log changes
             self.log_changes(metadata_type, new_file)
             
@@ -172,46 +583,77 @@ class MetadataScrubber:
             
             # Show verification
             print("\nVerifying changes...")
-            self.verify_changes(new_file, metadata_type)
+            self.verify_changes(new_file, metadata_type, exif_data)
             
         except Exception as e:
             print(f"Error during metadata removal: {e}")
 
-    def verify_changes(self, new_file, metadata_type):
-        """Verify that metadata was actually removed"""
+    def scrub_paths(self, paths, metadata_type, workers=os.cpu_count(), output_dir=None, quiet=False):
+        """Scrub many files in parallel without any interactive prompts"""
+        results = []
+        self._ensure_log()
+        if output_dir:
+            os.makedirs(output_dir, exist_ok=True)
+        
+        # Write log rows as results come back
+        with ProcessPoolExecutor(workers) as executor:
+            scrub = partial(_scrub_one, metadata_type=metadata_type, output_dir=output_dir,
+                            paranoid=self.paranoid)
+            for path, new_path in executor.map(scrub, paths, chunksize=16):
+                if new_path is None:
+                    continue
+                self._log_row(path, new_path, metadata_type)
+                results.append((path, new_path))
+        self._log_fh.flush()
+        
+        if not quiet:
+            print(f"\nRemoved {metadata_type} metadata from {len(results)} file(s).")
+        return results
+
+    def verify_changes(self, new_file, metadata_type, exif_data):
+        """Verify that metadata was actually removed
+
+        exif_data is what was just written to new_file, so the file itself is
+        only read back in paranoid mode or when the backend patched it
+        without parsing (exif_data is None).
+        """
         try:
-            with Image.open(new_file) as img:
-                exif = img._getexif()
-                if exif:
-                    new_metadata = self.get_readable_exif(exif)
-                    
-                    print("\nVerification Results:")
-                    print("-" * 50)
-                    
-                    if metadata_type == "datetime":
-                        date_tags = ['DateTime', 'DateTimeOriginal', 'DateTimeDigitized']
-                        found_dates = False
-                        for tag in date_tags:
-                            if tag in new_metadata:
-                                found_dates = True
-                                print(f"Warning: {tag} still present in file!")
-                        if not found_dates:
-                            print("Success: All date/time information removed!")
-                            
-                    elif metadata_type == "gps":
-                        found_gps = False
-                        for tag in new_metadata:
-                            if tag.startswith('GPS'):
-                                found_gps = True
-                                print(f"Warning: {tag} still present in file!")
-                        if not found_gps:
-                            print("Success: All GPS information removed!")
-                    
-                    print("-" * 50)
-                    
-                else:
-                    print("Success: No EXIF data found in new file!")
-                    
+            # Only a result read back from new_file counts as verified
+            from_disk = self.paranoid or exif_data is None
+            if self.paranoid:
+                exif_data = self.backend.load(new_file)
+            elif exif_data is None:
+                # Patched in place without parsing, so read the result back
+                exif_data = self._cached_exif(new_file)
+            
+            # Only the subset that was removed needs converting
+            new_metadata = self.backend.to_readable(exif_data, metadata_type)
+            
+            print("\nVerification Results:")
+            print("-" * 50)
+            
+            # new_metadata only holds the removed subset, so anything left
+            # in it is a leftover; date tags are checked by set intersection
+            if metadata_type == "datetime":
+                leftover = _DT_NAMES & new_metadata.keys()
+                success = "Success: All date/time information removed!"
+            elif metadata_type == "gps":
+                leftover = new_metadata.keys()
+                success = "Success: All GPS information removed!"
+            else:
+                leftover = new_metadata.keys()
+                success = "Success: All metadata removed!"
+            
+            for tag in sorted(leftover, key=str):
+                print(f"Warning: {tag} still present in file!")
+            if not leftover:
+                print(success)
+                if not from_disk:
+                    print("(Checked the metadata that was written, not the file; "
+                          "use --paranoid to re-read it from disk.)")
+            
+            print("-" * 50)
+            
         except Exception as e:
             print(f"Error during verification: {e}")
 
@@ -219,16 +661,11 @@ class MetadataScrubber:
         """Display metadata of the most recent file"""
         latest_file = self.get_latest_clean_file()
         if latest_file:
-            try:
-                with Image.open(latest_file) as img:
-                    exif = img._getexif()
-                    if exif:
-                        current_metadata = self.get_readable_exif(exif)
-                        self.display_exif_tool_style(current_metadata)
-                    else:
-                        print("\nNo EXIF data found in current file.")
-            except Exception as e:
-                print(f"Error reading current metadata: {e}")
+            current_metadata = self.backend.to_readable(self._cached_exif(latest_file))
+            if current_metadata:
+                self.display_exif_tool_style(current_metadata)
+            else:
+                print("\nNo EXIF data found in current file.")
         else:
             print("\nNo cleaned files found.")
 
@@ -238,24 +675,35 @@ class MetadataScrubber:
             return self.latest_clean_file
         return None
 
+    def _ensure_log(self):
+        """Open the log file once and keep the writer for later rows"""
+        if self._log_writer is not None:
+            return
+        self._log_fh = open(self.log_file, 'a', newline='', buffering=1 << 16)
+        self._log_writer = csv.writer(self._log_fh)
+        if os.fstat(self._log_fh.fileno()).st_size == 0:
+            self._log_writer.writerow(_LOG_HEADERS)
+        # Batch rows are flushed once per run, anything left on exit
+        atexit.register(self._log_fh.close)
+
     def log_changes(self, metadata_type, new_file):
-        headers = ['Timestamp', 'Original File', 'New File', 'Metadata Removed']
-        file_exists = os.path.exists(self.log_file)
-        
-        with open(self.log_file, 'a', newline='') as f:
-            writer = csv.writer(f)
-            if not file_exists:
-                writer.writerow(headers)
-            writer.writerow([
-                datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-                self.file_path,
-                new_file,
-                metadata_type
-            ])
+        self._ensure_log()
+        self._log_row(self.file_path, new_file, metadata_type)
+        # Interactive sessions can sit in input() indefinitely and be killed
+        # there, so write each row out as soon as it's logged
+        self._log_fh.flush()
+
+    def _log_row(self, original_file, new_file, metadata_type):
+        self._log_writer.writerow((
+            datetime.now().isoformat(sep=' ', timespec='seconds'),
+            original_file,
+            new_file,
+            metadata_type
+        ))
 
     def compare_metadata(self):
         """Compare original and current metadata"""
-        if not self.original_metadata:
+        if not self.original_exif:
             print("\nNo original metadata available to compare.")
             return
             
@@ -265,46 +713,46 @@ class MetadataScrubber:
             return
             
         # Get current metadata from the latest clean file
-        current_metadata = {}
-        try:
-            with Image.open(latest_file) as img:
-                exif = img._getexif()
-                if exif:
-                    current_metadata = self.get_readable_exif(exif)
-        except Exception as e:
-            print(f"Error reading current metadata: {e}")
-            return
+        current_metadata = self.backend.to_readable(self._cached_exif(latest_file))
+        original_metadata = self._original_metadata()
             
         # Display comparison
-        print("\nMetadata Comparison:")
-        print("="* 90)
-        print(f"{'Tag':<30} | {'Original Value':<25} | {'Current Value':<25}")
-        print("=" * 90)
+        rows = [
+            "\nMetadata Comparison:",
+            "=" * 90,
+            _ROW_FMT('Tag', 'Original Value', 'Current Value', ''),
+            "=" * 90,
+        ]
         
         # Get all unique tags from both metadata sets
-        all_tags = sorted(set(list(self.original_metadata.keys()) | set(current_metadata.keys())))
-        for tag in all_tags:
-            orig_value = self.original_metadata.get(tag, "Not present")
-            curr_value = current_metadata.get(tag, "Removed")
-            
-            # Format values for display
-            orig_value = self._format_value_for_display(orig_value)
-            curr_value = self._format_value_for_display(curr_value)
-            
-            # Determine if there's a change
-            changed = orig_value != curr_value
+        for tag in sorted(original_metadata.keys() | current_metadata.keys(), key=str):
+            orig_value = self._format_value_for_display(original_metadata.get(tag, "Not present"))
+            curr_value = self._format_value_for_display(current_metadata.get(tag, "Removed"))
             
-            # Print with change indicator
-            if changed:
-                print(f"{tag:<30} | {orig_value[:25]:<25} | {curr_value[:25]:<25} *")
-            else:
-                print(f"{tag:<30} | {orig_value[:25]:<25} | {curr_value[:25]:<25}")
+            # Mark changed or removed values
+            mark = ' *' if orig_value != curr_value else ''
+            rows.append(_ROW_FMT(tag, orig_value, curr_value, mark))
                 
-        print("=" * 90)
-        print("* indicates changed or removed metadata")
+        rows.append("=" * 90)
+        rows.append("* indicates changed or removed metadata")
+        self._write_rows(rows)
+
+    def _cached_exif(self, path, exif_bytes=None):
+        """Return backend.load(path, exif_bytes), parsing only the first time"""
+        if self._metadata_cache.get(path) is None:
+            self._metadata_cache[path] = self.backend.load(path, exif_bytes)
+        return self._metadata_cache[path]
+
+    def _original_metadata(self):
+        """The source file's metadata, decoded by the backend like every cleaned file
+
+        Parsed from the EXIF block read in extract_metadata when the backend
+        can, so the source isn't opened again.
+        """
+        return self.backend.to_readable(self._cached_exif(self.file_path, self._source_exif_bytes))
 
     def _format_value_for_display(self, value):
-        """Format metadata values for display"""
+        """Format metadata values for display, at most 25 characters long"""
         if isinstance(value, bytes):
             return f"[{len(value)} bytes]"
         elif isinstance(value, tuple):
@@ -315,8 +763,82 @@ class MetadataScrubber:
                 return str_value[:22] + "..."
             return str_value
 
+def expand_globs(patterns, unmatched=None):
+    """Lazily yield the JPG files matched by paths, directories or glob patterns
+
+    A pattern that names no JPG file is reported and, if unmatched is given,
+    appended to it so the caller can fail the run.
+    """
+    seen = set()
+    for pattern in patterns:
+        if os.path.isfile(pattern):
+            # Files named outright are always scrubbed, whatever their name
+            paths = [pattern] if pattern.lower().endswith(('.jpg', '.jpeg')) else []
+        else:
+            search = os.path.join(pattern, '**', '*') if os.path.isdir(pattern) else pattern
+            # Skip our own output so reruns don't scrub cleaned copies again
+            paths = (path for path in glob.iglob(search, recursive=True)
+                     if path.lower().endswith(('.jpg', '.jpeg')) and os.path.isfile(path)
+                     and not _CLEAN_NAME.search(os.path.basename(path)))
+        matched = False
+        for path in paths:
+            matched = True
+            # Overlapping patterns must not scrub the same file twice
+            key = os.path.normpath(path)
+            if key not in seen:
+                seen.add(key)
+                yield path
+        if not matched:
+            print(f"Warning: no JPG files to scrub matched '{pattern}'")
+            if unmatched is not None:
+                unmatched.append(pattern)
+
+def _positive_int(value):
+    """argparse type for counts that must be at least 1"""
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be a positive integer, got {value}")
+    return number
+
 def main():
-    scrubber = MetadataScrubber()
+    parser = argparse.ArgumentParser(
+        description="Remove metadata from JPG images. Runs the interactive menu when no input is given.")
+    parser.add_argument('--input', nargs='+', metavar='PATH',
+                        help="files, directories or glob patterns to scrub")
+    parser.add_argument('--remove', choices=['datetime', 'gps', 'all'],
+                        help="metadata to remove from every input file")
+    parser.add_argument('--output-dir', help="write cleaned files here instead of next to the originals")
+    parser.add_argument('--workers', type=_positive_int, default=os.cpu_count(),
+                        help="number of worker processes (default: CPU count)")
+    parser.add_argument('--quiet', action='store_true', help="only print errors")
+    parser.add_argument('--paranoid', action='store_true',
+                        help="re-read every cleaned file from disk to verify it")
+    args = parser.parse_args()
+    
+    if (args.input or args.remove) and not (args.input and args.remove):
+        parser.error("--input and --remove must be given together")
+    
+    try:
+        scrubber = MetadataScrubber(paranoid=args.paranoid)
+    except (ValueError, ImportError) as e:
+        # Bad METASCRUB_BACKEND or its library isn't installed
+        print(f"Error: {e}")
+        sys.exit(1)
+    
+    if args.input:
+        # Expand every pattern before any worker starts writing into the tree
+        unmatched = []
+        paths = list(expand_globs(args.input, unmatched))
+        results = scrubber.scrub_paths(paths, args.remove, workers=args.workers,
+                                       output_dir=args.output_dir, quiet=args.quiet)
+        # Any input left with its metadata must not look like success
+        failed = len(paths) - len(results)
+        if failed:
+            print(f"Error: {failed} file(s) could not be scrubbed.")
+        if failed or unmatched:
+            sys.exit(1)
+        return
+    
     scrubber.welcome_screen()
     
     if scrubber.get_file_path():
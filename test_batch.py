@@ -0,0 +1,77 @@
+import os
+import sys
+
+import piexif
+import pytest
+from PIL import Image
+
+from meta_scrubber_v3 import expand_globs, main
+
+
+def _jpeg(path):
+    """Save a small JPEG carrying a GPS latitude reference"""
+    exif = piexif.dump({'GPS': {piexif.GPSIFD.GPSLatitudeRef: b'N'}})
+    Image.new('RGB', (8, 8)).save(path, 'JPEG', exif=exif)
+    return str(path)
+
+
+def _run(monkeypatch, *args):
+    """Run the CLI and return its exit status"""
+    monkeypatch.setattr(sys, 'argv', ['meta_scrubber_v3.py', *args])
+    try:
+        main()
+    except SystemExit as e:
+        return e.code
+    return 0
+
+
+@pytest.fixture
+def tree(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / 'd').mkdir()
+    for name in ('a.jpg', 'a_clean_1.jpg', 'house_clean.jpg'):
+        _jpeg(tmp_path / 'd' / name)
+    (tmp_path / 'd' / 'notes.txt').write_text('x')
+    return tmp_path
+
+
+def test_directory_skips_cleaned_output(tree):
+    found = sorted(os.path.basename(path) for path in expand_globs(['d']))
+    assert found == ['a.jpg', 'house_clean.jpg']
+
+
+def test_glob_skips_cleaned_output(tree):
+    found = sorted(os.path.basename(path) for path in expand_globs(['d/*.jpg']))
+    assert found == ['a.jpg', 'house_clean.jpg']
+
+
+def test_literal_path_is_never_filtered(tree):
+    assert list(expand_globs(['d/a_clean_1.jpg'])) == ['d/a_clean_1.jpg']
+
+
+def test_overlapping_patterns_yield_once(tree):
+    assert list(expand_globs(['d/a.jpg', 'd/a*.jpg', './d/a.jpg'])) == ['d/a.jpg']
+
+
+def test_unmatched_patterns_are_reported(tree, capsys):
+    unmatched = []
+    assert list(expand_globs(['typo.jpg', 'd/notes.txt', 'd/*.png', 'd/a.jpg'], unmatched)) == ['d/a.jpg']
+    assert unmatched == ['typo.jpg', 'd/notes.txt', 'd/*.png']
+    assert "typo.jpg" in capsys.readouterr().out
+
+
+def test_exit_status_success(tree, monkeypatch):
+    assert _run(monkeypatch, '--input', 'd/house_clean.jpg', '--remove', 'gps',
+                '--workers', '1') == 0
+    assert piexif.load('d/house_clean_clean_1.jpg')['GPS'] == {}
+
+
+@pytest.mark.parametrize('inputs', [
+    pytest.param(['typo.jpg'], id='missing'),
+    pytest.param(['d/a.jpg', 'typo.jpg'], id='one-missing'),
+    pytest.param(['d/*.png'], id='glob-matches-nothing'),
+    pytest.param(['bad.jpg', 'd/a.jpg'], id='scrub-fails'),
+])
+def test_exit_status_failure(tree, monkeypatch, inputs):
+    (tree / 'bad.jpg').write_text('not a jpeg')
+    assert _run(monkeypatch, '--input', *inputs, '--remove', 'gps', '--workers', '1') == 1
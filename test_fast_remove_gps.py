@@ -0,0 +1,99 @@
+import io
+import struct
+
+import piexif
+import pytest
+from PIL import Image
+
+from meta_scrubber_v3 import fast_remove_gps
+
+LATITUDE = (40, 1, 26, 1, 4632, 100)
+
+
+def _entry(e, tag, field_type, count, value):
+    """One 12-byte IFD entry; value is the packed 4-byte value/offset field"""
+    return struct.pack(e + 'HHI', tag, field_type, count) + value
+
+
+def _tiff(e, gps=True, gps_offset=None):
+    """TIFF block with Make in IFD0 and, optionally, a GPS IFD with a latitude"""
+    order = b'II' if e == '<' else b'MM'
+    entries = [_entry(e, 0x010F, 2, 4, b'Cam\x00')]
+    if gps:
+        gps_ifd = 8 + 2 + 12 * 2 + 4
+        entries.append(_entry(e, 0x8825, 4, 1, struct.pack(e + 'I', gps_offset or gps_ifd)))
+    tiff = order + struct.pack(e + 'HI', 42, 8)
+    tiff += struct.pack(e + 'H', len(entries)) + b''.join(entries) + struct.pack(e + 'I', 0)
+    if gps:
+        data = gps_ifd + 2 + 12 * 2 + 4
+        tiff += struct.pack(e + 'H', 2)
+        tiff += _entry(e, 1, 2, 2, b'N\x00\x00\x00')
+        tiff += _entry(e, 2, 5, 3, struct.pack(e + 'I', data))
+        tiff += struct.pack(e + 'I', 0)
+        tiff += struct.pack(e + '6I', *LATITUDE)
+    return tiff
+
+
+def _app1(payload):
+    return b'\xff\xe1' + struct.pack('>H', len(payload) + 2) + payload
+
+
+def _jpeg(*segments):
+    """A real baseline JPEG with the given segments inserted after SOI"""
+    buf = io.BytesIO()
+    Image.new('RGB', (8, 8)).save(buf, 'JPEG')
+    data = buf.getvalue()
+    return data[:2] + b''.join(segments) + data[2:]
+
+
+def _write(tmp_path, data):
+    path = tmp_path / 'photo.jpg'
+    path.write_bytes(data)
+    return path
+
+
+@pytest.mark.parametrize('e', ['<', '>'], ids=['II', 'MM'])
+def test_blanks_gps_ifd(tmp_path, e):
+    path = _write(tmp_path, _jpeg(_app1(b'Exif\x00\x00' + _tiff(e))))
+    size = path.stat().st_size
+
+    assert fast_remove_gps(str(path))
+
+    data = path.read_bytes()
+    assert len(data) == size
+    assert struct.pack(e + '6I', *LATITUDE) not in data
+    exif = piexif.load(str(path))
+    assert exif['GPS'] == {}
+    assert exif['0th'][piexif.ImageIFD.Make] == b'Cam'
+
+
+def test_no_gps_pointer_leaves_file_unchanged(tmp_path):
+    original = _jpeg(_app1(b'Exif\x00\x00' + _tiff('<', gps=False)))
+    path = _write(tmp_path, original)
+
+    assert fast_remove_gps(str(path))
+    assert path.read_bytes() == original
+
+
+def test_skips_non_exif_app1(tmp_path):
+    xmp = _app1(b'http://ns.adobe.com/xap/1.0/\x00<x:xmpmeta/>')
+    path = _write(tmp_path, _jpeg(xmp, _app1(b'Exif\x00\x00' + _tiff('>'))))
+
+    assert fast_remove_gps(str(path))
+    assert piexif.load(str(path))['GPS'] == {}
+    assert xmp in path.read_bytes()
+
+
+@pytest.mark.parametrize('data', [
+    pytest.param(_jpeg(_app1(b'http://ns.adobe.com/xap/1.0/\x00<x:xmpmeta/>')), id='only-xmp'),
+    pytest.param(_jpeg(b'\xff\xe1\x00\x00'), id='zero-length'),
+    pytest.param(_jpeg()[:2] + b'\xff\xe1\x01\x00Exif\x00\x00II', id='truncated'),
+    pytest.param(_jpeg(_app1(b'Exif\x00\x00XX' + _tiff('<')[2:])), id='bad-byte-order'),
+    pytest.param(_jpeg(_app1(b'Exif\x00\x00' + _tiff('<', gps_offset=0xFFFF))), id='gps-offset-out-of-range'),
+    pytest.param(b'GIF89a' + bytes(32), id='not-jpeg'),
+])
+def test_malformed_input_is_left_alone(tmp_path, data):
+    path = _write(tmp_path, data)
+
+    assert not fast_remove_gps(str(path))
+    assert path.read_bytes() == data